@@ -1,6 +1,7 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+import snapshot_store
+from data_source import get_data_source
 
 # ---- Streamlit Page Setup ----
 st.set_page_config(page_title="AV Accident Dashboard", layout="wide")
@@ -11,21 +12,31 @@ st.title("AV Accident Dashboard")
 st.markdown("---")
 st.header("Load Dataset")
 
-# ---- Dataset URL ----
-DATA_URL = "https://raw.githubusercontent.com/nhusna01/EA2025/main/processed_av_accident_data.csv"
-
 # ---- Load the dataset ----
-try:
-    df = pd.read_csv(DATA_URL)
+source = get_data_source()
+snapshot = source.get()
+if snapshot is None:
+    st.error("Dataset is not available yet. Please refresh the page shortly.")
+    st.stop()
+snapshot_store.enable(source)
+
+if snapshot.origin == "remote":
     st.success("Dataset loaded successfully from GitHub!")
-except Exception as e:
-    st.error(f"Failed to load dataset. Error: {e}")
-    df = None
+else:
+    st.info("Showing the bundled copy of the dataset while the latest version loads from GitHub.")
+
+# ---- Severity Filter ----
+# The unfiltered view is served from a pre-rendered snapshot; picking a severity runs the live engine
+severities = st.sidebar.multiselect(
+    "Filter by Severity",
+    snapshot_store.filter_options(snapshot, "visualization1"),
+    help="Leave empty to show every record.",
+)
+view = snapshot_store.get_view(snapshot, "visualization1", severities)
 
 # ---- Display dataset preview ----
-if df is not None:
-    st.markdown("Data Preview")
-    st.dataframe(df.head(), use_container_width=True)
+st.markdown("Data Preview")
+st.dataframe(view["preview"], use_container_width=True)
 
 # ---- Optional styling for neat layout ----
 st.markdown("""
@@ -102,20 +113,7 @@ st.markdown(
 # ---- Custom Metrics with 'help' icon ----
 st.markdown("### Key Metrics Overview")
 
-# Ensure required columns exist and compute values safely
-total_records = len(df)
-
-unique_severity = df["Severity"].nunique() if "Severity" in df.columns else "N/A"
-avg_speed = f"{df['SV Precrash Speed (MPH)'].mean():.2f}" if "SV Precrash Speed (MPH)" in df.columns else "N/A"
-avg_limit = f"{df['Posted Speed Limit (MPH)'].mean():.2f}" if "Posted Speed Limit (MPH)" in df.columns else "N/A"
-
-# --- Metric Display Setup ---
-metrics = [
-    ("Total Accident Records", total_records, "Total number of accident cases recorded in the dataset."),
-    ("Unique Severity Levels", unique_severity, "Number of distinct severity categories (POD, Serious, Moderate, Minor)."),
-    ("Average Pre-Crash Speed (MPH)", avg_speed, "Mean pre-crash vehicle speed across all records."),
-    ("Average Posted Speed Limit (MPH)", avg_limit, "Mean posted speed limit for all accident locations.")
-]
+metrics = view["metrics"]
 
 # --- Display Metrics in 4 Columns ---
 cols = st.columns(4)
@@ -147,76 +145,24 @@ st.header(" Visualizations")
 
 # --- 1.1 Box Plot: Pre-crash Speed vs Severity ---
 st.subheader("1.1  Distribution of Pre-Crash Speed Across Accident Severity Levels")
-if "Severity" in df.columns and "SV Precrash Speed (MPH)" in df.columns:
-    fig1 = px.box(
-        df,
-        x="Severity",
-        y="SV Precrash Speed (MPH)",
-        color="Severity",
-        title="Pre-crash Speed vs Severity",
-        color_discrete_sequence=[
-            '#FF0000', '#FF7F00', '#FFD700', '#32CD32', '#00FFFF', '#0000FF', '#FF00FF'
-        ]
-    )
-    fig1.update_traces(marker=dict(line=dict(width=1, color='black')), opacity=1)
-    fig1.update_layout(
-        title_font=dict(size=18, color='black', family="Arial Black"),
-        plot_bgcolor='white'
-    )
-    st.plotly_chart(fig1, use_container_width=True)
+if view["figures"]["1.1"] is not None:
+    st.plotly_chart(view["figures"]["1.1"], use_container_width=True)
     st.info(" **Insight:** Higher pre-crash speeds are associated with greater accident severity. Outliers detected the highest among POD severity as SV Precrash Speed (MPH) increased compared to minor and moderate")
 else:
     st.warning("Columns 'Severity' or 'SV Precrash Speed (MPH)' not found in dataset.")
 
 # --- 1.2 Grouped Bar: Severity by Lighting ---
 st.subheader("1.2 Impact of Lighting Conditions on Accident Severity")
-if "Severity" in df.columns and "Lighting" in df.columns:
-    counts = df.groupby(['Severity', 'Lighting']).size().reset_index(name='Count')
-    fig2 = px.bar(
-        counts,
-        x='Severity',
-        y='Count',
-        color='Lighting',
-        barmode='group',
-        title='Accident Severity Distribution under Various Lighting Conditions',
-        color_discrete_sequence=[
-            '#FF0000', '#FF7F00', '#FFFF00', '#00FF00', '#00FFFF', '#0000FF', '#FF00FF'
-        ]
-    )
-    fig2.update_traces(text=counts['Count'], textposition='outside')
-    fig2.update_layout(
-        plot_bgcolor='white',
-        title_font=dict(size=18, color='black', family="Arial Black"),
-        xaxis_title='Severity',
-        yaxis_title='Count of Incidents',
-        xaxis=dict(showgrid=True, gridcolor='lightgray'),
-        yaxis=dict(showgrid=True, gridcolor='lightgray')
-    )
-    st.plotly_chart(fig2, use_container_width=True)
+if view["figures"]["1.2"] is not None:
+    st.plotly_chart(view["figures"]["1.2"], use_container_width=True)
     st.info("**Insight:** Lighting conditions influence accident severity, while poor visibility often leads to more severe outcomes. Among those lighting shows, accident occurrences cause POD severity at the highest compared to serious injuries.")
 else:
     st.warning("Columns 'Severity' or 'Lighting' not found in dataset.")
 
 # --- 1.3 Correlation Heatmap ---
 st.subheader("1.3 Correlation Between Key Driving Parameters")
-required_cols = ['Mileage', 'Posted Speed Limit (MPH)', 'SV Precrash Speed (MPH)']
-if all(col in df.columns for col in required_cols):
-    corr_vars = df[required_cols].apply(pd.to_numeric, errors='coerce').dropna()
-    corr_matrix = corr_vars.corr(method='pearson')
-    fig3 = px.imshow(
-        corr_matrix.values,
-        x=corr_matrix.columns,
-        y=corr_matrix.index,
-        color_continuous_scale=['#FFFF00', '#FF7F00', '#FF0000'],
-        text_auto=".2f",
-        aspect="auto",
-        title="Correlation Matrix of Driving Variables"
-    )
-    fig3.update_layout(
-        title_font=dict(size=18, color='black', family="Arial Black"),
-        plot_bgcolor='white'
-    )
-    st.plotly_chart(fig3, use_container_width=True)
+if view["figures"]["1.3"] is not None:
+    st.plotly_chart(view["figures"]["1.3"], use_container_width=True)
     st.info(" **Insight:** Stronger warm colors indicate stronger positive correlations between the numeric variables. Posted Speed Limit shows strong positive relationships with SV Precrash Speed, meanwhile mileage contribute weak correlation towards both speed variables.")
 else:
     st.warning("Required numeric columns not found for correlation analysis.")
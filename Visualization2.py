@@ -1,6 +1,7 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+import snapshot_store
+from data_source import get_data_source
 
 # ---- Streamlit Page Setup ----
 st.set_page_config(page_title="AV Accident Dashboard", layout="wide")
@@ -11,21 +12,31 @@ st.title("AV Accident Dashboard")
 st.markdown("---")
 st.header("Load Dataset")
 
-# ---- Dataset URL ----
-DATA_URL = "https://raw.githubusercontent.com/nhusna01/EA2025/main/processed_av_accident_data.csv"
-
 # ---- Load the dataset ----
-try:
-    df = pd.read_csv(DATA_URL)
+source = get_data_source()
+snapshot = source.get()
+if snapshot is None:
+    st.error("Dataset is not available yet. Please refresh the page shortly.")
+    st.stop()
+snapshot_store.enable(source)
+
+if snapshot.origin == "remote":
     st.success("Dataset loaded successfully from GitHub!")
-except Exception as e:
-    st.error(f"Failed to load dataset. Error: {e}")
-    df = None
+else:
+    st.info("Showing the bundled copy of the dataset while the latest version loads from GitHub.")
+
+# ---- Severity Filter ----
+# The unfiltered view is served from a pre-rendered snapshot; picking a severity runs the live engine
+severities = st.sidebar.multiselect(
+    "Filter by Severity",
+    snapshot_store.filter_options(snapshot, "visualization2"),
+    help="Leave empty to show every record.",
+)
+view = snapshot_store.get_view(snapshot, "visualization2", severities)
 
 # ---- Display dataset preview ----
-if df is not None:
-    st.markdown("Data Preview")
-    st.dataframe(df.head(), use_container_width=True)
+st.markdown("Data Preview")
+st.dataframe(view["preview"], use_container_width=True)
 
 # ---- Optional styling for neat layout ----
 st.markdown("""
@@ -102,33 +113,7 @@ st.markdown(
 # ---- Custom Metrics with 'help' icon ----
 st.markdown("Key Metrics Overview")
 
-# --- Compute Key Metrics ---
-total_manufacturers = df["Make"].nunique() if "Make" in df.columns else "N/A"
-total_models = df["Model"].nunique() if "Model" in df.columns else "N/A"
-
-# Top manufacturer by number of accidents
-if "Make" in df.columns:
-    top_manufacturer = df["Make"].value_counts().idxmax()
-    top_manufacturer_count = df["Make"].value_counts().max()
-    top_manufacturer_display = f"{top_manufacturer_count}"
-else:
-    top_manufacturer_display = "N/A"
-
-# Top operational entity by accidents
-if "Operating Entity" in df.columns:
-    top_entity = df["Operating Entity"].value_counts().idxmax()
-    top_entity_count = df["Operating Entity"].value_counts().max()
-    top_entity_display = f"{top_entity_count}"
-else:
-    top_entity_display = "N/A"
-
-# --- Metric Display Setup ---
-metrics = [
-    ("Total Manufacturers", total_manufacturers, "Number of unique vehicle manufacturers involved in accidents."),
-    ("Total Vehicle Models", total_models, "Count of distinct autonomous vehicle models in the dataset."),
-    ("Top Manufacturer by Accidents", top_manufacturer_display, "Manufacturer with the highest recorded accident count: Jaguar."),
-    ("Top Operating Entity by Accidents", top_entity_display, "Operational entity involved in the most accidents: Waymo LLC.")
-]
+metrics = view["metrics"]
 
 # --- Display Metrics in 4 Columns ---
 cols = st.columns(4)
@@ -160,28 +145,8 @@ st.header("Visualizations")
 
 # --- 2.1 Histogram + Box Plot: Make Distribution by Severity ---
 st.subheader("2.1 Distribution of Vehicle Makes by Accident Severity")
-if "Make" in df.columns and "Severity" in df.columns:
-    fig1 = px.histogram(
-        df,
-        x="Make",
-        color="Severity",
-        marginal="box",
-        title="Distribution of Vehicle Makes by Severity",
-        hover_data=['Make', 'Model', 'Model Year', 'Mileage', 'Cluster ID', 'Severity'],
-        color_discrete_sequence=[
-            '#FF0000', '#FF7F00', '#FFD700', '#32CD32', '#00FFFF', '#0000FF', '#FF00FF'
-        ]
-    )
-    fig1.update_layout(
-        title_font=dict(size=18, color='black', family="Arial Black"),
-        xaxis_title='Vehicle Make',
-        yaxis_title='Number of Incidents',
-        plot_bgcolor='white',
-        xaxis=dict(showgrid=True, gridcolor='lightgray', tickangle=45),
-        yaxis=dict(showgrid=True, gridcolor='lightgray'),
-        margin=dict(l=50, r=30, t=80, b=50)
-    )
-    st.plotly_chart(fig1, use_container_width=True)
+if view["figures"]["2.1"] is not None:
+    st.plotly_chart(view["figures"]["2.1"], use_container_width=True)
     st.info("**Insight:** The histogram shows which vehicle makes are most frequently involved in incidents and how severity levels vary among them. Certain manufacturers display higher accident frequencies or more severe outcomes, suggesting potential performance or operational variations.")
 else:
     st.warning("Columns 'Make' or 'Severity' not found in dataset.")
@@ -189,32 +154,8 @@ else:
 
 # --- 2.2 Stacked Bar Chart: Accident Distribution by Model Year and Severity ---
 st.subheader("2.2 Accident Distribution by Model Year and Severity")
-if "Model Year" in df.columns and "Severity" in df.columns:
-    df_counts = df.groupby(['Model Year', 'Severity']).size().reset_index(name='Count')
-    df_counts['Model Year'] = df_counts['Model Year'].astype(str)
-    df_counts = df_counts.sort_values('Model Year')
-
-    fig2 = px.bar(
-        df_counts,
-        x='Model Year',
-        y='Count',
-        color='Severity',
-        barmode='relative',
-        title='Accident Distribution by Model Year and Severity',
-        color_discrete_sequence=[
-            '#FF0000', '#FF7F00', '#FFD700', '#32CD32', '#00FFFF', '#0000FF', '#FF00FF'
-        ]
-    )
-    fig2.update_traces(text=df_counts['Count'], textposition='outside')
-    fig2.update_layout(
-        plot_bgcolor='white',
-        title_font=dict(size=18, color='black', family="Arial Black"),
-        xaxis_title='Model Year',
-        yaxis_title='Number of Incidents',
-        xaxis=dict(showgrid=True, gridcolor='lightgray'),
-        yaxis=dict(showgrid=True, gridcolor='lightgray')
-    )
-    st.plotly_chart(fig2, use_container_width=True)
+if view["figures"]["2.2"] is not None:
+    st.plotly_chart(view["figures"]["2.2"], use_container_width=True)
     st.info("**Insight:** This stacked bar chart highlights how accident severity differs across vehicle model years. Certain years show higher frequencies of severe incidents, indicating that production year may influence vehicle reliability and safety performance.")
 else:
     st.warning("Columns 'Model Year' or 'Severity' not found in dataset.")
@@ -222,31 +163,8 @@ else:
 
 # --- 2.3 Density Plot: Severity by Air Bag Deployment ---
 st.subheader("2.3 Severity Distribution by Air Bag Deployment Status")
-if "Air_Bag" in df.columns and "Severity" in df.columns:
-    fig3 = px.violin(
-        df,
-        x="Air_Bag",
-        y="Severity",
-        color="Air_Bag",
-        box=True,
-        points="all",
-        title="Severity Distribution by Air Bag Deployment",
-        color_discrete_sequence=[
-            '#FF0000', '#FF7F00', '#FFD700', '#32CD32', '#00FFFF', '#0000FF', '#FF00FF'
-        ]
-    )
-    fig3.update_traces(opacity=0.85, line=dict(width=1.5), marker=dict(size=4, opacity=0.6))
-    fig3.update_layout(
-        title_font=dict(size=18, color='black', family="Arial Black"),
-        plot_bgcolor='white',
-        xaxis_title='Air Bag Deployment Status',
-        yaxis_title='Severity',
-        xaxis=dict(showgrid=True, gridcolor='lightgray'),
-        yaxis=dict(showgrid=True, gridcolor='lightgray'),
-        showlegend=True,
-        legend_title_text='Air Bag Deployment'
-    )
-    st.plotly_chart(fig3, use_container_width=True)
+if view["figures"]["2.3"] is not None:
+    st.plotly_chart(view["figures"]["2.3"], use_container_width=True)
     st.info("**Insight:** The density plot visualizes how accident severity distributes between vehicles with and without airbag deployment. Wider sections show higher concentrations of incidents, indicating that airbag activation relates closely to the severity of collisions.")
 else:
     st.warning("Columns 'Air_Bag' or 'Severity' not found in dataset.")
@@ -1,7 +1,7 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+
+import snapshot_store
+from data_source import get_data_source
 
 # ---- Streamlit Page Setup ----
 st.set_page_config(page_title="AV Accident Dashboard", layout="wide")
@@ -13,19 +13,30 @@ st.title("AV Accident Dashboard")
 st.markdown("---")
 st.header("Load Dataset")
 
-DATA_URL = "https://raw.githubusercontent.com/nhusna01/EA2025/main/processed_av_accident_data.csv"
+source = get_data_source()
+snapshot = source.get()
+if snapshot is None:
+    st.error("Dataset is not available yet. Please refresh the page shortly.")
+    st.stop()
+snapshot_store.enable(source)
 
-try:
-    df = pd.read_csv(DATA_URL)
+if snapshot.origin == "remote":
     st.success("Dataset loaded successfully from GitHub!")
-except Exception as e:
-    st.error(f"Failed to load dataset. Error: {e}")
-    df = None
+else:
+    st.info("Showing the bundled copy of the dataset while the latest version loads from GitHub.")
+
+# ---- Severity Filter ----
+# The unfiltered view is served from a pre-rendered snapshot; picking a severity runs the live engine
+severities = st.sidebar.multiselect(
+    "Filter by Severity",
+    snapshot_store.filter_options(snapshot, "visualization3"),
+    help="Leave empty to show every record.",
+)
+view = snapshot_store.get_view(snapshot, "visualization3", severities)
 
 # Display preview
-if df is not None:
-    st.markdown("**Data Preview**")
-    st.dataframe(df.head(), use_container_width=True)
+st.markdown("**Data Preview**")
+st.dataframe(view["preview"], use_container_width=True)
 
 # =========================
 # Objective 3 Section
@@ -61,19 +72,8 @@ with col3:
 st.markdown("---")
 st.header("Key Metrics Overview")
 
-# Calculate key metrics
-total_serious = df[df["Severity"] == "Serious"].shape[0] if "Severity" in df.columns else "N/A"
-most_common_weather = df["Weather"].mode()[0] if "Weather" in df.columns else "N/A"
-common_severity = df["Severity"].value_counts().idxmax() if "Severity" in df.columns else "N/A"
-common_collision = df["Crash_With"].value_counts().idxmax() if "Crash_With" in df.columns else "N/A"
-
 # Display metrics in cards
-metrics = [
-    ("Total Serious Accidents", total_serious, "Total number of accidents classified as serious."),
-    ("Most Common Weather", most_common_weather, "Weather condition where most accidents occurred: Clear."),
-    ("Most Frequent Severity", common_severity, "Severity level with the highest number of cases: Property Damage Only (POD)."),
-    ("Most Common Collision Type", common_collision, "Type of collision that occurred most frequently: Pedestrian Collision (PD)."),
-]
+metrics = view["metrics"]
 
 cols = st.columns(4)
 for col, (label, value, help_text) in zip(cols, metrics):
@@ -99,19 +99,8 @@ st.header("Visualizations")
 
 # ----------------- 3.1 Violin Plot: Speed Distribution by Weather -----------------
 st.subheader("3.1 Violin Plot: Speed Distribution by Weather")
-if "Weather" in df.columns and "SV Precrash Speed (MPH)" in df.columns:
-    fig = px.violin(
-        df,
-        x='Weather',
-        y='SV Precrash Speed (MPH)',
-        color='Weather',
-        box=True,
-        points='all',
-        title='Speed Distribution Across Weather Conditions',
-        color_discrete_sequence=['#FF0000','#FF7F00','#FFFF00','#00FF00','#00FFFF','#0000FF','#FF00FF']
-    )
-    fig.update_layout(xaxis_title='Weather', yaxis_title='Pre-Crash Speed (MPH)', plot_bgcolor='white')
-    st.plotly_chart(fig, use_container_width=True)
+if view["figures"]["3.1"] is not None:
+    st.plotly_chart(view["figures"]["3.1"], use_container_width=True)
 
     st.info("**Insight:** Most vehicles travel faster in clear weather, while speeds drop in rain or fog. "
             "The wider violin shapes in clear weather indicate more high-speed variability. "
@@ -119,17 +108,8 @@ if "Weather" in df.columns and "SV Precrash Speed (MPH)" in df.columns:
 
 # ----------------- 3.2 Pie Chart: Accident Severity by Collision Type -----------------
 st.subheader("3.2 Pie Chart: Accident Severity by Collision Type")
-if "Crash_With" in df.columns and "Severity" in df.columns:
-    crash_data = df.groupby(['Crash_With']).size().reset_index(name='Count')
-
-    fig = px.pie(
-        crash_data,
-        names='Crash_With',
-        values='Count',
-        title='Accident Proportion by Collision Type',
-        color_discrete_sequence=['#FF0000','#FF7F00','#FFFF00','#00FF00','#00FFFF','#0000FF','#FF00FF']
-    )
-    st.plotly_chart(fig, use_container_width=True)
+if view["figures"]["3.2"] is not None:
+    st.plotly_chart(view["figures"]["3.2"], use_container_width=True)
 
     st.info("**Insight:** Rear-end and vehicle-to-vehicle collisions occur most frequently, making them the dominant crash types. "
             "Less frequent types like pedestrian or object collisions still contribute to injury-related cases. "
@@ -137,45 +117,9 @@ if "Crash_With" in df.columns and "Severity" in df.columns:
 
 # ----------------- 3.3 Radar Chart: Environmental Factors by Weather -----------------
 st.subheader("3.3 Radar Chart: Environmental Factors by Weather")
-
-required_cols = ['Weather', 'Roadway_Type', 'Roadway_Surface', 'Lighting']
-if all(col in df.columns for col in required_cols):
-
-    radar_data = df.groupby(required_cols).size().reset_index(name='Incident_Count')
-    top_weather = radar_data.groupby('Weather')['Incident_Count'].sum().nlargest(3).index
-    radar_data = radar_data[radar_data['Weather'].isin(top_weather)]
-
-    axes = ['Roadway_Type', 'Roadway_Surface', 'Lighting']
-    traces = []
-    
-    # Custom Colors
-    custom_colors = ['#FF0000', '#FF7F00', '#FFFF00', '#00FF00', '#00FFFF', '#0000FF', '#FF00FF']
-
-    for i, weather in enumerate(top_weather):
-        subset = radar_data[radar_data['Weather'] == weather]
-        values = [subset.groupby(axis)['Incident_Count'].sum().max() if not subset.empty else 0 for axis in axes]
-        values.append(values[0])
-
-        traces.append(go.Scatterpolar(
-            r=values,
-            theta=axes + [axes[0]],
-            fill='toself',
-            name=weather,
-            opacity=0.7,
-            line=dict(color=custom_colors[i])  # Fix: Assign color directly to each trace
-        ))
-
-    fig = go.Figure(data=traces)
-    fig.update_layout(
-        title='Environmental Factors by Weather',
-        polar=dict(radialaxis=dict(visible=True)),
-        showlegend=True
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+if view["figures"]["3.3"] is not None:
+    st.plotly_chart(view["figures"]["3.3"], use_container_width=True)
 
     st.info("**Insight:** Clear weather shows more incidents on urban roads with dry surfaces and proper lighting. "
             "Rainy conditions shift accidents toward wet surfaces and lower visibility areas, showing how weather "
             "influences the relationship between roadway and lighting conditions.")
-
-
@@ -0,0 +1,300 @@
+import dataclasses
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+
+import query
+
+# ---- Dataset Location ----
+DATA_URL = os.environ.get(
+    "EA2025_DATA_URL",
+    "https://raw.githubusercontent.com/nhusna01/EA2025/main/processed_av_accident_data.csv",
+)
+
+# Local copy (CSV or Parquet) served until the first remote fetch succeeds
+BUNDLED_PATH = os.environ.get(
+    "EA2025_DATA_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "processed_av_accident_data.csv"),
+)
+
+# Fetched files are kept on disk so large ones can be queried in place
+CACHE_DIR = os.environ.get(
+    "EA2025_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"),
+)
+
+# Columns the visualization pages read; a payload without them (an HTML error page,
+# a different CSV) is rejected instead of replacing good data
+REQUIRED_COLUMNS = (
+    "Severity", "Make", "Model", "Model Year", "Operating Entity", "Cluster ID", "Mileage",
+    "Roadway_Type", "Roadway_Surface", "Posted Speed Limit (MPH)", "Lighting", "Weather",
+    "Crash_With", "Air_Bag", "SV Precrash Speed (MPH)",
+)
+
+# ---- Refresh Settings ----
+REFRESH_INTERVAL = 300  # seconds before a snapshot is considered stale
+FETCH_TIMEOUT = 10      # wall-clock seconds per HTTP attempt, download included
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0      # seconds, doubled after each failed attempt
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Last good copy of the dataset."""
+    frame: Optional[pd.DataFrame]  # None when the file is large enough to be queried with DuckDB
+    path: str
+    version: str     # sha256 of the raw file bytes
+    origin: str      # "remote" or "bundled"
+    loaded_at: float
+    db_path: Optional[str] = None  # DuckDB file the CSV was loaded into, when frame is None
+
+
+def _copy_hashed(src, dst, deadline=None):
+    """Stream ``src`` into ``dst`` chunk by chunk. Returns (version hash, bytes copied).
+
+    ``deadline`` is a ``time.monotonic()`` value; passing it raises ``TimeoutError``.
+    Socket timeouts only bound each read, so a server trickling bytes would never trip them.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    read = getattr(src, "read1", src.read)  # read1 returns what has arrived instead of waiting for a full chunk
+    while True:
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError(f"Download took longer than the deadline ({size} bytes so far)")
+        chunk = read(1024 * 1024)
+        if not chunk:
+            break
+        digest.update(chunk)
+        size += len(chunk)
+        if dst is not None:
+            dst.write(chunk)
+    return digest.hexdigest()[:16], size
+
+
+class DataSource:
+    """Serves the last good snapshot immediately and refreshes it in the background.
+
+    ``get()`` never blocks on the network: when the snapshot is older than
+    ``refresh_interval`` it starts a single background fetch (timeouts plus
+    retry with exponential backoff) and keeps serving the stale copy until
+    the fetch succeeds. A failed refresh leaves the previous snapshot in place.
+    """
+
+    def __init__(self, url=DATA_URL, bundled_path=BUNDLED_PATH, cache_dir=CACHE_DIR,
+                 refresh_interval=REFRESH_INTERVAL, timeout=FETCH_TIMEOUT, max_retries=MAX_RETRIES,
+                 backoff_base=BACKOFF_BASE):
+        self.url = url
+        self.bundled_path = bundled_path
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+
+        self.last_error = None
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)  # signalled when a refresh finishes
+        self._refreshing = False
+        self._listeners = []
+        self._retired_files = []
+
+        self._load_bundled()
+
+    # ---- Public API ----
+    def get(self):
+        """Return the current snapshot (may be None if nothing has loaded yet)."""
+        snapshot = self._snapshot
+        if snapshot is None or time.time() - snapshot.loaded_at > self.refresh_interval:
+            self.refresh()
+        return snapshot
+
+    def add_listener(self, callback):
+        """Call ``callback(snapshot)`` in a background thread whenever a new data version lands.
+
+        Callbacks run before the new version is served, so work such as pre-rendering
+        finishes before any session sees it. The current snapshot is handed over
+        straight away so the listener never misses it.
+        """
+        # Under the lock so a concurrent _publish either sees this listener or has already swapped
+        with self._lock:
+            self._listeners.append(callback)
+            snapshot = self._snapshot
+        if snapshot is not None:
+            threading.Thread(target=callback, args=(snapshot,), name="data-source-listener", daemon=True).start()
+
+    def refresh(self):
+        """Start a background fetch unless one is already running. Returns the thread or None."""
+        with self._lock:
+            if self._refreshing:
+                return None
+            self._refreshing = True
+        thread = threading.Thread(target=self._refresh_worker, name="data-source-refresh", daemon=True)
+        thread.start()
+        return thread
+
+    def refresh_now(self):
+        """Fetch synchronously (used by scripts and tests). Returns True on success.
+
+        Waits for any background refresh to finish first so two fetches never overlap.
+        """
+        with self._idle:
+            while self._refreshing:
+                self._idle.wait()
+            self._refreshing = True
+        return self._refresh_worker()
+
+    # ---- Internals ----
+    def _load_bundled(self):
+        if not self.bundled_path or not os.path.exists(self.bundled_path):
+            return
+        try:
+            with open(self.bundled_path, "rb") as f:
+                version, _ = _copy_hashed(f, None)
+            self._publish(self.bundled_path, version, "bundled", loaded_at=0.0)  # 0.0 so the first get() triggers a refresh
+        except Exception as e:
+            self.last_error = e
+
+    def _fetch(self):
+        """Download into the cache directory. Returns (path, version)."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        suffix = ".parquet" if self.url.endswith(".parquet") else ".csv"
+        request = urllib.request.Request(self.url, headers={"User-Agent": "EA2025-dashboard"})
+        deadline = time.monotonic() + self.timeout
+        fd, tmp_path = tempfile.mkstemp(suffix=suffix, dir=self.cache_dir)
+        try:
+            # Wrap the descriptor first so it is closed even when the connection fails
+            with os.fdopen(fd, "wb") as f, urllib.request.urlopen(request, timeout=self.timeout) as response:
+                version, size = _copy_hashed(response, f, deadline)
+                expected = response.headers.get("Content-Length")
+            # Sized reads don't raise IncompleteRead, so a dropped connection must be caught here
+            if expected is not None and int(expected) != size:
+                raise IOError(f"Incomplete download: got {size} of {expected} bytes")
+            path = os.path.join(self.cache_dir, version + suffix)
+            os.replace(tmp_path, path)
+            return path, version
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _refresh_worker(self):
+        try:
+            for attempt in range(self.max_retries):
+                try:
+                    path, version = self._fetch()
+                    try:
+                        self._publish(path, version, "remote")
+                    except Exception:
+                        # Don't leave rejected payloads (or their DuckDB files) in the cache
+                        keep = self._cache_files(self._snapshot) + self._retired_files
+                        self._remove([path, self._db_path(path, version)], keep)
+                        raise
+                    self.last_error = None
+                    return True
+                except Exception as e:
+                    self.last_error = e
+                    if attempt + 1 < self.max_retries:
+                        time.sleep(self.backoff_base * (2 ** attempt))
+            # Every attempt failed: keep the old snapshot but don't retry until the next interval
+            current = self._snapshot
+            if current is not None:
+                self._snapshot = dataclasses.replace(current, loaded_at=time.time())
+            return False
+        finally:
+            with self._idle:
+                self._refreshing = False
+                self._idle.notify_all()
+
+    def _publish(self, path, version, origin, loaded_at=None):
+        loaded_at = time.time() if loaded_at is None else loaded_at
+        previous = self._snapshot
+        if previous is not None and previous.version == version:
+            # Same bytes as what we already serve: just mark it fresh
+            self._snapshot = dataclasses.replace(previous, origin=origin, loaded_at=loaded_at)
+            if path != previous.path and os.path.dirname(path) == self.cache_dir:
+                os.remove(path)
+            return
+
+        # Unparseable data raises here and a wrong schema below, so a bad payload never replaces a good one
+        db_path = None
+        if query.use_duckdb(path):
+            # Parse a large CSV once per version; every later query reads the DuckDB file
+            frame = None
+            db_path = self._db_path(path, version)
+            if db_path is not None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            backend = query.DuckDBBackend(path, db_path)
+            columns = backend.columns
+            backend.close()
+        else:
+            frame = query.read_frame(path)
+            columns = list(frame.columns)
+        missing = [col for col in REQUIRED_COLUMNS if col not in columns]
+        if missing:
+            raise ValueError(f"Dataset is missing columns: {', '.join(missing)}")
+
+        snapshot = Snapshot(frame, path, version, origin, loaded_at, db_path)
+        # Swap only after the listeners so sessions keep the previous version until it is ready.
+        # Callbacks run outside the lock; one registered meanwhile is called before the swap.
+        notified = []
+        while True:
+            with self._lock:
+                pending = [cb for cb in self._listeners if cb not in notified]
+                if not pending:
+                    self._snapshot = snapshot
+                    break
+            for callback in pending:
+                notified.append(callback)
+                try:
+                    callback(snapshot)
+                except Exception:
+                    pass  # a broken listener must not turn a good fetch into a retry
+        self._retire(previous, snapshot)
+
+    def _db_path(self, path, version):
+        if path.endswith(".parquet"):
+            return None  # Parquet is scanned in place
+        return os.path.join(self.cache_dir, version + ".duckdb")
+
+    def _cache_files(self, snapshot):
+        if snapshot is None:
+            return []
+        files = [snapshot.path, snapshot.db_path]
+        return [f for f in files if f is not None and os.path.dirname(f) == self.cache_dir]
+
+    @staticmethod
+    def _remove(files, keep):
+        for f in files:
+            if f is not None and f not in keep and os.path.exists(f):
+                os.remove(f)
+
+    def _retire(self, previous, current):
+        """Delete the cached files from two versions ago; the last ones may still be in use.
+
+        Files are named by content, so after A -> B -> A the "stale" files are the
+        current ones again and must be kept.
+        """
+        stale, self._retired_files = self._retired_files, self._cache_files(previous)
+        self._remove(stale, self._cache_files(current) + self._retired_files)
+
+
+# ---- Shared Instance ----
+_source = None
+_source_lock = threading.Lock()
+
+
+def get_data_source():
+    """One DataSource per Streamlit worker process, shared by every session and page."""
+    global _source
+    with _source_lock:
+        if _source is None:
+            _source = DataSource()
+        return _source
@@ -0,0 +1,370 @@
+"""Load generator for the dashboard.
+
+Starts ``streamlit run main.py`` locally (or attaches to a running server),
+opens many simulated browser sessions over Streamlit's websocket protocol and
+replays interaction sequences across the navigation: homepage, coursework
+upload page and the three visualization pages, including severity filter
+changes. Reports throughput, p50/p95/p99 rerun latency and the worker's
+CPU/RSS over time. Linux only (worker stats come from /proc); needs nothing
+beyond the packages in requirements.txt.
+
+    python loadtest.py --users 50 --duration 120
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.MultiSelect_pb2 import MultiSelect
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ---- Interaction Sequences ----
+# ("page", url_path) navigates; ("filter", n) selects the first n severity levels
+# on the current page (0 clears the filter); ("rerun",) reruns the current page.
+SCENARIOS = [
+    # Browses every page once
+    [("page", ""), ("page", "Academic"), ("page", "Visualization1"),
+     ("page", "Visualization2"), ("page", "Visualization3")],
+    # Read-only viewer flicking between visualizations
+    [("page", "Visualization1"), ("page", "Visualization2"), ("page", "Visualization1"),
+     ("page", "Visualization3"), ("rerun",)],
+    # Analyst filtering the charts
+    [("page", "Visualization1"), ("filter", 1), ("filter", 2), ("filter", 0),
+     ("page", "Visualization3"), ("filter", 1), ("filter", 0)],
+    # Student checking the coursework page
+    [("page", ""), ("page", "Academic"), ("rerun",), ("page", "")],
+]
+
+RERUN_TIMEOUT = 60  # seconds to wait for script_finished before counting a rerun as failed
+RECONNECT_BACKOFF = (0.5, 10.0)  # first and maximum delay (s) between reconnect attempts
+
+
+# ---- Streamlit Server ----
+def start_server(port):
+    cmd = [
+        sys.executable, "-m", "streamlit", "run", "main.py",
+        "--server.headless", "true",
+        "--server.port", str(port),
+        "--browser.gatherUsageStats", "false",
+    ]
+    return subprocess.Popen(cmd, cwd=APP_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_healthy(port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=2) as response:
+                if response.read().strip() == b"ok":
+                    return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Streamlit did not become healthy on port {port} within {timeout}s")
+
+
+# ---- Worker Stats ----
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def read_proc_stats(pid):
+    """(cpu seconds, rss bytes) for ``pid`` from /proc, or None once it has exited."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Fields after the command name; the name itself may contain spaces
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as f:
+            rss_pages = int(f.read().split()[1])
+    except (FileNotFoundError, ProcessLookupError):
+        return None
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS  # utime + stime
+    return cpu_seconds, rss_pages * PAGE_SIZE
+
+
+async def monitor_worker(pid, interval, samples, stop):
+    previous = read_proc_stats(pid)
+    previous_at = time.monotonic()
+    started = previous_at
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        current = read_proc_stats(pid)
+        now = time.monotonic()
+        if current is None or previous is None:
+            break
+        cpu_percent = 100.0 * (current[0] - previous[0]) / (now - previous_at)
+        samples.append({"t": now - started, "cpu_percent": cpu_percent, "rss_mb": current[1] / 2 ** 20})
+        previous, previous_at = current, now
+
+
+# ---- Simulated Session ----
+class ScriptError(Exception):
+    """The page script raised or failed to compile; the connection itself is still usable."""
+
+
+class Session:
+    """One browser tab: a websocket plus the page and widget state the frontend would keep."""
+
+    def __init__(self, port):
+        self.port = port
+        self.conn = None
+        self.page = ""
+        self.page_hashes = {}       # url_path -> page_script_hash, learned from navigation messages
+        self.severity_widget = None  # (widget id, options) of the filter on the current page
+        self.filter_count = 0        # severity levels currently selected on that page
+
+    async def connect(self):
+        self.conn = await websocket_connect(
+            f"ws://127.0.0.1:{self.port}/_stcore/stream",
+            subprotocols=["streamlit"],
+        )
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+    def _widget_state(self, count):
+        widget_id, options = self.severity_widget
+        state = WidgetState(id=widget_id)
+        if "raw_values" in MultiSelect.DESCRIPTOR.fields_by_name:
+            # Newer Streamlit versions send the selected option strings
+            state.string_array_value.data.extend(options[:count])
+        else:
+            state.int_array_value.data.extend(range(min(count, len(options))))
+        return state
+
+    async def rerun(self, page, filter_count=None):
+        """Send a rerun for ``page`` and wait for the script to finish. Returns latency in seconds.
+
+        Like the browser, every rerun re-sends the current filter selection, so a plain
+        rerun of a filtered page stays on the live engine instead of the snapshot.
+        Raises ``ScriptError`` when the page shows an exception or fails to compile:
+        Streamlit still reports such runs as finished.
+        """
+        if page != self.page:
+            # Widgets belong to the page that rendered them
+            self.severity_widget = None
+            self.filter_count = 0
+        self.page = page
+        if filter_count is not None:
+            self.filter_count = filter_count
+
+        msg = BackMsg()
+        client_state = msg.rerun_script
+        client_state.query_string = ""
+        client_state.page_name = page
+        client_state.page_script_hash = self.page_hashes.get(page, "")
+        if self.severity_widget is not None:
+            client_state.widget_states.widgets.append(self._widget_state(self.filter_count))
+
+        errors = []
+        started = time.perf_counter()
+        await self.conn.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            raw = await asyncio.wait_for(self.conn.read_message(), timeout=RERUN_TIMEOUT)
+            if raw is None:
+                raise ConnectionError("websocket closed by server")
+            fwd = ForwardMsg.FromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "navigation":
+                for app_page in fwd.navigation.app_pages:
+                    self.page_hashes[app_page.url_pathname] = app_page.page_script_hash
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                if element.WhichOneof("type") == "multiselect":
+                    self.severity_widget = (element.multiselect.id, list(element.multiselect.options))
+                elif element.WhichOneof("type") == "exception":
+                    errors.append(f"{element.exception.type}: {element.exception.message}")
+            elif kind == "script_finished":
+                if fwd.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if fwd.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    errors.append("script failed to compile")
+                if errors:
+                    raise ScriptError("; ".join(errors))
+                return time.perf_counter() - started
+
+
+async def connect_with_backoff(user_id, port, deadline, results):
+    """Open a new session, retrying with exponential backoff. Returns None once the run is over."""
+    delay, max_delay = RECONNECT_BACKOFF
+    while time.monotonic() < deadline:
+        session = Session(port)
+        try:
+            await session.connect()
+            return session
+        except Exception as e:
+            results.append({"user": user_id, "action": "connect", "page": None, "at": time.monotonic(),
+                            "latency": None, "ok": False, "error": f"{type(e).__name__}: {e}"})
+        await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        delay = min(delay * 2, max_delay)
+    return None
+
+
+async def simulated_user(user_id, port, deadline, think_time, results):
+    rng = random.Random(user_id)
+    session = await connect_with_backoff(user_id, port, deadline, results)
+    try:
+        while session is not None and time.monotonic() < deadline:
+            for step in rng.choice(SCENARIOS):
+                if time.monotonic() >= deadline:
+                    break
+                action = step[0]
+                if action == "page":
+                    page, filter_count = step[1], None
+                elif action == "filter":
+                    page, filter_count = session.page, step[1]
+                else:
+                    page, filter_count = session.page, None
+
+                record = {"user": user_id, "action": action, "page": page or "home", "at": time.monotonic()}
+                try:
+                    record["latency"] = await session.rerun(page, filter_count)
+                    record["ok"] = True
+                except ScriptError as e:
+                    record["latency"] = None
+                    record["ok"] = False
+                    record["error"] = f"{type(e).__name__}: {e}"
+                except Exception as e:
+                    record["latency"] = None
+                    record["ok"] = False
+                    record["error"] = f"{type(e).__name__}: {e}"
+                    results.append(record)
+                    session.close()
+                    # The new session starts on the home page, so the rest of this scenario no longer applies
+                    session = await connect_with_backoff(user_id, port, deadline, results)
+                    break
+                results.append(record)
+                await asyncio.sleep(rng.uniform(*think_time))
+    finally:
+        if session is not None:
+            session.close()
+
+
+# ---- Reporting ----
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(results, samples, elapsed):
+    reruns = [r for r in results if r["action"] != "connect"]
+    ok = [r for r in reruns if r["ok"]]
+    latencies = [r["latency"] for r in ok]
+    summary = {
+        "reruns": len(reruns),
+        "failed": len(reruns) - len(ok),
+        "connect_failures": len(results) - len(reruns),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(ok) / elapsed if elapsed else 0.0,
+        "pages": {},
+        "worker": samples,
+    }
+    if latencies:
+        summary.update({f"p{p}_ms": percentile(latencies, p) * 1000 for p in (50, 95, 99)})
+    for page in sorted({r["page"] for r in ok}):
+        page_latencies = [r["latency"] for r in ok if r["page"] == page]
+        summary["pages"][page] = {
+            "reruns": len(page_latencies),
+            **{f"p{p}_ms": percentile(page_latencies, p) * 1000 for p in (50, 95, 99)},
+        }
+    return summary
+
+
+def print_report(summary):
+    print(f"\nReruns: {summary['reruns']}  failed: {summary['failed']}  "
+          f"connect failures: {summary['connect_failures']}  elapsed: {summary['elapsed_s']:.1f}s  throughput: {summary['throughput_rps']:.2f} reruns/s")
+    if "p50_ms" in summary:
+        print(f"Rerun latency  p50: {summary['p50_ms']:.0f} ms  "
+              f"p95: {summary['p95_ms']:.0f} ms  p99: {summary['p99_ms']:.0f} ms")
+
+    print(f"\n{'Page':<16}{'Reruns':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for page, stats in summary["pages"].items():
+        print(f"{page:<16}{stats['reruns']:>8}{stats['p50_ms']:>10.0f}{stats['p95_ms']:>10.0f}{stats['p99_ms']:>10.0f}")
+
+    if summary["worker"]:
+        print(f"\n{'t (s)':>8}{'CPU %':>10}{'RSS MB':>10}")
+        for sample in summary["worker"]:
+            print(f"{sample['t']:>8.1f}{sample['cpu_percent']:>10.1f}{sample['rss_mb']:>10.1f}")
+
+
+# ---- Entry Point ----
+async def run(args, worker_pid):
+    results = []
+    samples = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_worker(worker_pid, args.sample_interval, samples, stop)) if worker_pid else None
+
+    started = time.monotonic()
+    deadline = started + args.duration
+    users = []
+    for user_id in range(args.users):
+        users.append(asyncio.create_task(
+            simulated_user(user_id, args.port, deadline, (args.think_min, args.think_max), results)
+        ))
+        await asyncio.sleep(1.0 / args.spawn_rate)  # ramp up instead of a thundering herd
+
+    outcomes = await asyncio.gather(*users, return_exceptions=True)
+    elapsed = time.monotonic() - started
+    stop.set()
+    if monitor is not None:
+        await monitor
+
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            print(f"User task failed: {type(outcome).__name__}: {outcome}", file=sys.stderr)
+    return summarize(results, samples, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent dashboard users against main.py.")
+    parser.add_argument("--users", type=int, default=20, help="number of concurrent simulated sessions")
+    parser.add_argument("--spawn-rate", type=float, default=5.0, help="sessions started per second")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to keep replaying scenarios")
+    parser.add_argument("--think-min", type=float, default=0.5, help="minimum pause between interactions (s)")
+    parser.add_argument("--think-max", type=float, default=3.0, help="maximum pause between interactions (s)")
+    parser.add_argument("--port", type=int, default=8599, help="port for the Streamlit worker")
+    parser.add_argument("--attach", action="store_true", help="use a server already running on --port")
+    parser.add_argument("--pid", type=int, help="worker pid to monitor when using --attach")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="seconds between CPU/RSS samples")
+    parser.add_argument("--json", help="also write the full report to this file")
+    args = parser.parse_args()
+
+    server = None
+    if args.attach:
+        worker_pid = args.pid
+    else:
+        server = start_server(args.port)
+        worker_pid = server.pid
+    try:
+        wait_until_healthy(args.port)
+        summary = asyncio.run(run(args, worker_pid))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    print_report(summary)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import os
+import threading
+
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:  # optional: without it every dataset is served by pandas
+    duckdb = None
+
+# ---- Backend Selection ----
+# Files larger than this are queried in place with DuckDB instead of being loaded into pandas
+PANDAS_MAX_BYTES = int(os.environ.get("EA2025_PANDAS_MAX_MB", "256")) * 1024 * 1024
+
+# Plots that draw every row (box, violin, histogram) get at most this many sampled rows
+SAMPLE_ROWS = 200_000
+
+
+def use_duckdb(path):
+    """True when ``path`` is too large for pandas and DuckDB is installed."""
+    return duckdb is not None and path is not None and os.path.getsize(path) > PANDAS_MAX_BYTES
+
+
+def read_frame(path):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def with_filter(filters, column, values):
+    """Add ``column IN values`` to a filter dict, intersecting with any existing condition."""
+    filters = dict(filters or {})
+    if column in filters:
+        values = [value for value in filters[column] if value in values]
+    filters[column] = list(values)
+    return filters
+
+
+# ---- In-memory pandas backend ----
+class PandasBackend:
+    """Runs every query on a DataFrame held in memory."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.columns = list(frame.columns)
+
+    def _filtered(self, filters):
+        df = self.frame
+        for column, values in (filters or {}).items():
+            series = df[column]
+            if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+                df = df[series.isin(values)]
+            else:
+                # Filter values arrive as strings; only non-text columns need the (copying) cast
+                df = df[series.astype(str).isin([str(value) for value in values])]
+        return df
+
+    def count(self, filters=None):
+        return len(self._filtered(filters))
+
+    def distinct(self, column, filters=None):
+        return sorted(self._filtered(filters)[column].dropna().astype(str).unique().tolist())
+
+    def nunique(self, column, filters=None):
+        return self._filtered(filters)[column].nunique()
+
+    def mean(self, column, filters=None):
+        return self._filtered(filters)[column].mean()
+
+    def top_value(self, column, filters=None):
+        """Most frequent value and its count, or None when there are no rows.
+
+        Ties go to the smallest value, matching ``ORDER BY n DESC, col`` in DuckDBBackend.
+        """
+        counts = self._filtered(filters)[column].value_counts()
+        if counts.empty:
+            return None
+        top = counts.max()
+        return min(counts[counts == top].index), int(top)
+
+    def group_count(self, by, filters=None):
+        return self._filtered(filters).groupby(by).size().reset_index(name='Count')
+
+    def corr(self, columns, filters=None):
+        values = self._filtered(filters)[columns].apply(pd.to_numeric, errors='coerce').dropna()
+        return values.corr(method='pearson')
+
+    def rows(self, columns=None, filters=None, limit=None):
+        df = self._filtered(filters)
+        if columns is not None:
+            df = df[columns]
+        return df if limit is None else df.head(limit)
+
+    def sample(self, columns, filters=None, limit=SAMPLE_ROWS):
+        df = self._filtered(filters)[columns]
+        return df.sample(n=limit, random_state=0) if len(df) > limit else df
+
+
+# ---- Embedded DuckDB backend ----
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(path):
+    return "'" + path.replace("'", "''") + "'"  # DDL cannot take bound parameters
+
+
+def _load_csv(path, db_path):
+    """Parse ``path`` once into an ``incidents`` table in the DuckDB file ``db_path``.
+
+    The table is built under a temporary name and renamed into place, so a
+    half-built database is never opened.
+    """
+    tmp_path = f"{db_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        con = duckdb.connect(database=tmp_path)
+        try:
+            con.execute(f"CREATE TABLE incidents AS SELECT * FROM read_csv_auto({_literal(path)})")
+        finally:
+            con.close()
+        os.replace(tmp_path, db_path)
+    finally:
+        for leftover in (tmp_path, tmp_path + ".wal"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+class DuckDBBackend:
+    """Queries a CSV or Parquet file with DuckDB.
+
+    Parquet is scanned in place. A CSV is parsed once into the DuckDB file
+    ``db_path`` (or an in-memory table without one), so reruns never
+    re-read the CSV. Filters become SQL ``WHERE`` clauses, so only
+    matching rows are ever materialised, and DuckDB spreads each scan
+    over every core.
+    """
+
+    def __init__(self, path, db_path=None, threads=None):
+        self.path = path
+        self.db_path = db_path
+        if path.endswith(".parquet"):
+            self._con = duckdb.connect(database=":memory:")
+            self._con.execute(f"CREATE VIEW incidents AS SELECT * FROM read_parquet({_literal(path)})")
+        elif db_path is not None:
+            if not os.path.exists(db_path):
+                _load_csv(path, db_path)
+            self._con = duckdb.connect(database=db_path, read_only=True)
+        else:
+            self._con = duckdb.connect(database=":memory:")
+            self._con.execute(f"CREATE TABLE incidents AS SELECT * FROM read_csv_auto({_literal(path)})")
+        self._con.execute(f"SET threads TO {int(threads or os.cpu_count() or 1)}")
+        self.columns = [row[0] for row in self._con.execute("DESCRIBE incidents").fetchall()]
+
+    def close(self):
+        self._con.close()
+
+    def _sql(self, select, filters=None, where=(), tail=""):
+        clauses = list(where)
+        params = []
+        for column, values in (filters or {}).items():
+            if not values:
+                clauses.append("FALSE")
+                continue
+            clauses.append(f"CAST({_quote(column)} AS VARCHAR) IN ({', '.join('?' * len(values))})")
+            params.extend(str(value) for value in values)
+        sql = f"SELECT {select} FROM incidents"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return f"{sql} {tail}".strip(), params
+
+    def _query(self, select, filters=None, where=(), tail=""):
+        sql, params = self._sql(select, filters, where, tail)
+        # A cursor per query keeps the shared connection safe across Streamlit threads
+        return self._con.cursor().execute(sql, params)
+
+    def count(self, filters=None):
+        return self._query("COUNT(*)", filters).fetchone()[0]
+
+    def distinct(self, column, filters=None):
+        col = _quote(column)
+        result = self._query(f"DISTINCT CAST({col} AS VARCHAR)", filters, where=[f"{col} IS NOT NULL"])
+        return sorted(row[0] for row in result.fetchall())
+
+    def nunique(self, column, filters=None):
+        return self._query(f"COUNT(DISTINCT {_quote(column)})", filters).fetchone()[0]
+
+    def mean(self, column, filters=None):
+        value = self._query(f"AVG({_quote(column)})", filters).fetchone()[0]
+        return float("nan") if value is None else value
+
+    def top_value(self, column, filters=None):
+        col = _quote(column)
+        row = self._query(
+            f"{col}, COUNT(*) AS n", filters, where=[f"{col} IS NOT NULL"],
+            tail=f"GROUP BY {col} ORDER BY n DESC, {col} LIMIT 1",
+        ).fetchone()
+        return None if row is None else (row[0], int(row[1]))
+
+    def group_count(self, by, filters=None):
+        cols = ", ".join(_quote(column) for column in by)
+        return self._query(
+            f"{cols}, COUNT(*) AS \"Count\"", filters,
+            where=[f"{_quote(column)} IS NOT NULL" for column in by],
+            tail=f"GROUP BY {cols} ORDER BY {cols}",
+        ).df()
+
+    def corr(self, columns, filters=None):
+        casts = [f"TRY_CAST({_quote(column)} AS DOUBLE)" for column in columns]
+        pairs = [(i, j) for i in range(len(columns)) for j in range(i + 1, len(columns))]
+        select = ", ".join(f"CORR({casts[i]}, {casts[j]})" for i, j in pairs) or "1"
+        row = self._query(select, filters, where=[f"{cast} IS NOT NULL" for cast in casts]).fetchone()
+
+        matrix = pd.DataFrame(1.0, index=columns, columns=columns)
+        for (i, j), value in zip(pairs, row):
+            matrix.iloc[i, j] = matrix.iloc[j, i] = float("nan") if value is None else value
+        return matrix
+
+    def rows(self, columns=None, filters=None, limit=None):
+        select = "*" if columns is None else ", ".join(_quote(column) for column in columns)
+        tail = "" if limit is None else f"LIMIT {int(limit)}"
+        return self._query(select, filters, tail=tail).df()
+
+    def sample(self, columns, filters=None, limit=SAMPLE_ROWS):
+        select = ", ".join(_quote(column) for column in columns)
+        if self.count(filters) <= limit:
+            return self._query(select, filters).df()
+        # Sample after filtering so a narrow filter still gets a full-sized sample
+        sql, params = self._sql(select, filters)
+        sampled = f"SELECT * FROM ({sql}) USING SAMPLE reservoir({int(limit)} ROWS) REPEATABLE (0)"
+        return self._con.cursor().execute(sampled, params).df()
+
+
+# ---- Shared Backends ----
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def backend_for(snapshot):
+    """Backend for one data version, reused by every session until the data changes."""
+    with _backends_lock:
+        backend = _backends.get(snapshot.version)
+        if backend is None:
+            if snapshot.frame is not None:
+                backend = PandasBackend(snapshot.frame)
+            else:
+                backend = DuckDBBackend(snapshot.path, snapshot.db_path)
+            if len(_backends) >= 2:  # current version plus the one being pre-rendered
+                _backends.pop(next(iter(_backends)))
+            _backends[snapshot.version] = backend
+        return backend
@@ -0,0 +1,139 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+
+import query
+import views
+
+# ---- Snapshot Settings ----
+SNAPSHOT_MODE = os.environ.get("EA2025_SNAPSHOT_MODE", "1") != "0"
+SNAPSHOT_DIR = os.environ.get(
+    "EA2025_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshots"),
+)
+
+
+def _render_version():
+    """Hash of the code that renders views, so a deploy never serves artifacts from old builders."""
+    digest = hashlib.sha256()
+    for module in (views, query):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+RENDER_VERSION = _render_version()
+
+# Decoded artifacts for the current data version only, so repeat views skip the disk and gzip
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def artifact_path(version, page):
+    return os.path.join(SNAPSHOT_DIR, RENDER_VERSION, version, f"{page}.json.gz")
+
+
+def build_snapshot(snapshot):
+    """Pre-render the default (unfiltered) view of every page for one data version."""
+    for page, build in views.BUILDERS.items():
+        path = artifact_path(snapshot.version, page)
+        if os.path.exists(path):
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        view = build(query.backend_for(snapshot))
+        # A unique temp file per writer: two threads may build the same version at once
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump(view, f, separators=(",", ":"))
+            os.replace(tmp_path, path)  # atomic, so readers never see a half-written file
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    _prune(snapshot.version)
+
+
+def _prune(version):
+    """Delete artifacts from other builds and all but the last two data versions.
+
+    Like DataSource._retire, the previous version is kept because sessions may still be on it.
+    """
+    for name in os.listdir(SNAPSHOT_DIR):
+        if name != RENDER_VERSION:
+            shutil.rmtree(os.path.join(SNAPSHOT_DIR, name), ignore_errors=True)
+    root = os.path.join(SNAPSHOT_DIR, RENDER_VERSION)
+    os.utime(os.path.join(root, version))  # newest again after A -> B -> A, even with nothing rebuilt
+    others = [os.path.join(root, name) for name in os.listdir(root) if name != version]
+    others.sort(key=os.path.getmtime, reverse=True)
+    for stale in others[1:]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def load_view(version, page):
+    """Return the pre-rendered default view, or None if it has not been built yet."""
+    key = (version, page)
+    view = _loaded.get(key)
+    if view is not None:
+        return view
+    path = artifact_path(version, page)
+    if not os.path.exists(path):
+        return None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            view = json.load(f)
+    except (OSError, ValueError, EOFError, zlib.error):
+        return None  # a corrupt artifact falls back to the live engine
+    with _loaded_lock:
+        for stale in [k for k in _loaded if k[0] != version]:
+            del _loaded[stale]
+        _loaded[key] = view
+    return view
+
+
+def _on_new_snapshot(snapshot):
+    try:
+        build_snapshot(snapshot)
+    except Exception:
+        # Snapshots are an optimisation only; pages fall back to the live engine
+        pass
+
+
+# ---- Wiring ----
+_enabled = False
+_enabled_lock = threading.Lock()
+
+
+def enable(source):
+    """Pre-render every new data version published by ``source`` in the background."""
+    global _enabled
+    if not SNAPSHOT_MODE:
+        return
+    with _enabled_lock:
+        if _enabled:
+            return
+        _enabled = True
+    source.add_listener(_on_new_snapshot)
+
+
+# ---- Page Helpers ----
+def filter_options(snapshot, page):
+    view = load_view(snapshot.version, page) if SNAPSHOT_MODE else None
+    if view is not None:
+        return view["filter_options"]
+    return views.filter_options(query.backend_for(snapshot))
+
+
+def get_view(snapshot, page, severities):
+    """Serve the default view from its artifact; run the live engine only once a control changes."""
+    if not severities and SNAPSHOT_MODE:
+        view = load_view(snapshot.version, page)
+        if view is not None:
+            return view
+    backend = query.backend_for(snapshot)
+    return views.BUILDERS[page](backend, views.make_filters(backend, severities))
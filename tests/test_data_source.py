@@ -0,0 +1,240 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from data_source import DataSource  # noqa: E402
+
+REPO_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "processed_av_accident_data.csv")
+
+
+def _csv(rows):
+    with open(REPO_CSV, "rb") as f:
+        lines = f.read().splitlines(keepends=True)
+    return b"".join(lines[:rows + 1])
+
+
+DATA_A = _csv(5)
+DATA_B = _csv(10)
+
+
+# ---- Local stand-in for the GitHub raw server ----
+class StandIn(BaseHTTPRequestHandler):
+    # Set per test: (status, body, delay, truncate_to)
+    response = (200, DATA_A, 0, None)
+    trickle = 0  # seconds between body bytes, for a server that never quite stalls
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        status, body, delay, truncate_to = type(self).response
+        if delay:
+            time.sleep(delay)
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        body = body if truncate_to is None else body[:truncate_to]
+        try:
+            if type(self).trickle:
+                for i in range(len(body)):
+                    self.wfile.write(body[i:i + 1])
+                    self.wfile.flush()
+                    time.sleep(type(self).trickle)
+            else:
+                self.wfile.write(body)
+        except OSError:
+            pass  # the client gave up
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StandIn.response = (200, DATA_A, 0, None)
+    StandIn.trickle = 0
+    StandIn.hits = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/data.csv"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def bundled(tmp_path):
+    path = tmp_path / "bundled.csv"
+    path.write_bytes(DATA_B)
+    return str(path)
+
+
+def make_source(url, bundled, tmp_path, **kwargs):
+    kwargs.setdefault("refresh_interval", 300)
+    kwargs.setdefault("timeout", 2)
+    kwargs.setdefault("backoff_base", 0)
+    return DataSource(url=url, bundled_path=bundled, cache_dir=str(tmp_path / "cache"), **kwargs)
+
+
+def open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+# ---- Tests ----
+def test_serves_bundled_copy_then_refreshes_in_background(server, bundled, tmp_path):
+    source = make_source(server, bundled, tmp_path)
+
+    snapshot = source.get()  # stale (bundled) snapshot returned immediately
+    assert snapshot.origin == "bundled"
+    assert len(snapshot.frame) == 10
+
+    deadline = time.time() + 10
+    while source.get().origin != "remote" and time.time() < deadline:
+        time.sleep(0.05)
+    snapshot = source.get()
+    assert snapshot.origin == "remote"
+    assert len(snapshot.frame) == 5
+    assert os.path.exists(snapshot.path)
+
+
+def test_http_errors_retry_then_keep_last_good_snapshot(server, bundled, tmp_path):
+    StandIn.response = (500, b"oops", 0, None)
+    source = make_source(server, bundled, tmp_path, max_retries=3)
+
+    assert source.refresh_now() is False
+    assert StandIn.hits == 3
+    assert source.get().origin == "bundled"
+    assert source.last_error is not None
+
+
+def test_timeout_keeps_last_good_snapshot(server, bundled, tmp_path):
+    StandIn.response = (200, DATA_A, 1.0, None)
+    source = make_source(server, bundled, tmp_path, timeout=0.2, max_retries=2)
+
+    started = time.time()
+    assert source.refresh_now() is False
+    assert time.time() - started < 2.0
+    assert source.get().origin == "bundled"
+
+
+def test_trickled_body_hits_the_wall_clock_deadline(server, bundled, tmp_path):
+    StandIn.trickle = 0.02  # each read succeeds well within the socket timeout
+    source = make_source(server, bundled, tmp_path, timeout=0.5, max_retries=1)
+
+    started = time.time()
+    assert source.refresh_now() is False
+    assert time.time() - started < 2.0
+    assert isinstance(source.last_error, TimeoutError)
+    assert source.get().origin == "bundled"
+    assert os.listdir(tmp_path / "cache") == []
+
+    # The refresh flag was released, so the next refresh runs
+    StandIn.trickle = 0
+    assert source.refresh_now() is True
+    assert source.get().origin == "remote"
+
+
+def test_truncated_body_is_rejected(server, bundled, tmp_path):
+    # Cut inside the last row, so the partial file would still parse with the right columns
+    StandIn.response = (200, DATA_A, 0, len(DATA_A) - 20)
+    source = make_source(server, bundled, tmp_path, max_retries=1)
+
+    assert source.refresh_now() is False
+    assert source.get().origin == "bundled"
+    assert isinstance(source.last_error, OSError)
+    assert os.listdir(tmp_path / "cache") == []
+
+
+@pytest.mark.parametrize("body", [
+    b"<html><body>Rate limit exceeded</body></html>",
+    b"a,b,c\n1,2,3\n",
+])
+def test_wrong_schema_never_replaces_good_data(server, bundled, tmp_path, body):
+    StandIn.response = (200, body, 0, None)
+    source = make_source(server, bundled, tmp_path, max_retries=1)
+
+    assert source.refresh_now() is False
+    assert source.get().origin == "bundled"
+    assert isinstance(source.last_error, ValueError)
+    assert os.listdir(tmp_path / "cache") == []
+
+
+def test_failed_fetches_do_not_leak_file_descriptors(bundled, tmp_path):
+    source = make_source("http://127.0.0.1:1/data.csv", bundled, tmp_path, max_retries=3)
+    before = open_fds()
+    for _ in range(3):
+        assert source.refresh_now() is False
+    assert open_fds() == before
+    assert os.listdir(tmp_path / "cache") == []
+
+
+def test_reverted_data_keeps_current_cache_file(server, tmp_path):
+    bundled = tmp_path / "bundled.csv"
+    bundled.write_bytes(_csv(3))
+    source = make_source(server, str(bundled), tmp_path)
+    for body in (DATA_A, DATA_B, DATA_A):
+        StandIn.response = (200, body, 0, None)
+        assert source.refresh_now() is True
+        snapshot = source.get()
+        assert os.path.exists(snapshot.path)
+    assert len(snapshot.frame) == 5
+
+
+def test_refresh_now_waits_for_background_refresh(server, bundled, tmp_path):
+    StandIn.response = (200, DATA_A, 0.3, None)
+    source = make_source(server, bundled, tmp_path)
+
+    thread = source.refresh()
+    assert source.refresh_now() is True
+    thread.join(timeout=10)
+    assert StandIn.hits == 2  # one after the other, never overlapping
+    assert source.get().origin == "remote"
+
+
+def test_large_csv_is_loaded_into_duckdb_once_and_retired(server, tmp_path, monkeypatch):
+    pytest.importorskip("duckdb")
+    import query
+    monkeypatch.setattr(query, "PANDAS_MAX_BYTES", 0)  # treat every file as "large"
+
+    bundled = tmp_path / "bundled.csv"
+    bundled.write_bytes(_csv(3))
+    source = make_source(server, str(bundled), tmp_path)
+    db_files = []
+    for body in (DATA_A, DATA_B, DATA_A, DATA_B):
+        StandIn.response = (200, body, 0, None)
+        assert source.refresh_now() is True
+        snapshot = source.get()
+        assert snapshot.frame is None
+        assert os.path.exists(snapshot.db_path)
+        assert query.backend_for(snapshot).count() == body.count(b"\n") - 1
+        db_files.append(snapshot.db_path)
+
+    # Only the current and previous versions' files remain in the cache
+    cache = sorted(os.listdir(tmp_path / "cache"))
+    assert cache == sorted(os.path.basename(p) for f in set(db_files) for p in (f, f[:-len(".duckdb")] + ".csv"))
+
+
+def test_listener_added_during_publish_sees_new_version_before_swap(server, bundled, tmp_path):
+    source = make_source(server, bundled, tmp_path)
+    seen = []
+
+    def late(snapshot):
+        seen.append((snapshot.version, source.get().version))
+
+    def first(snapshot):
+        if snapshot.origin == "remote":
+            source.add_listener(late)  # registered while the publish is running its callbacks
+
+    source.add_listener(first)
+    bundled_version = source.get().version
+    assert source.refresh_now() is True
+
+    remote_version = source.get().version
+    assert (remote_version, bundled_version) in seen  # called with the new version, before the swap
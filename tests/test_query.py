@@ -0,0 +1,127 @@
+import math
+import os
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("duckdb")
+
+from query import DuckDBBackend, PandasBackend, with_filter  # noqa: E402
+
+REPO_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "processed_av_accident_data.csv")
+
+FILTERS = [
+    None,
+    {"Severity": ["Serious"]},
+    {"Severity": ["POD", "Moderate"]},
+    {"Severity": []},  # nothing selected matches nothing on both backends
+]
+
+
+@pytest.fixture(scope="module")
+def pandas_backend():
+    return PandasBackend(pd.read_csv(REPO_CSV))
+
+
+@pytest.fixture(scope="module", params=["memory", "file"])
+def duckdb_backend(request, tmp_path_factory):
+    if request.param == "memory":
+        backend = DuckDBBackend(REPO_CSV)
+    else:
+        backend = DuckDBBackend(REPO_CSV, str(tmp_path_factory.mktemp("db") / "incidents.duckdb"))
+    yield backend
+    backend.close()
+
+
+def _same_float(a, b):
+    return (math.isnan(a) and math.isnan(b)) or a == pytest.approx(b)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_scalar_queries_agree(pandas_backend, duckdb_backend, filters):
+    assert duckdb_backend.count(filters) == pandas_backend.count(filters)
+    for column in ("Severity", "Make", "Weather"):
+        assert duckdb_backend.distinct(column, filters) == pandas_backend.distinct(column, filters)
+        assert duckdb_backend.nunique(column, filters) == pandas_backend.nunique(column, filters)
+    for column in ("SV Precrash Speed (MPH)", "Posted Speed Limit (MPH)"):
+        assert _same_float(duckdb_backend.mean(column, filters), pandas_backend.mean(column, filters))
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("column", ["Make", "Operating Entity", "Weather", "Severity", "Crash_With", "Lighting"])
+def test_top_value_agrees_including_ties(pandas_backend, duckdb_backend, filters, column):
+    assert duckdb_backend.top_value(column, filters) == pandas_backend.top_value(column, filters)
+
+
+def test_top_value_ties_go_to_smallest_value():
+    backend = PandasBackend(pd.DataFrame({"Weather": ["Rain", "Clear", "Rain", "Clear", "Fog"]}))
+    assert backend.top_value("Weather") == ("Clear", 2)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("by", [["Severity", "Lighting"], ["Model Year", "Severity"], ["Crash_With"]])
+def test_group_count_agrees(pandas_backend, duckdb_backend, filters, by):
+    expected = pandas_backend.group_count(by, filters)
+    actual = duckdb_backend.group_count(by, filters)
+    assert list(actual.columns) == by + ["Count"]
+    assert actual.values.tolist() == expected.values.tolist()
+
+
+@pytest.mark.parametrize("filters", FILTERS[:3])
+def test_corr_agrees(pandas_backend, duckdb_backend, filters):
+    columns = ["Mileage", "Posted Speed Limit (MPH)", "SV Precrash Speed (MPH)"]
+    expected = pandas_backend.corr(columns, filters)
+    actual = duckdb_backend.corr(columns, filters)
+    assert list(actual.index) == columns and list(actual.columns) == columns
+    for a, b in zip(actual.values.ravel(), expected.values.ravel()):
+        assert _same_float(a, b)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_rows_agree(pandas_backend, duckdb_backend, filters):
+    columns = ["Severity", "Make", "Mileage"]
+    expected = pandas_backend.rows(columns, filters, limit=5)
+    actual = duckdb_backend.rows(columns, filters, limit=5)
+    assert actual.values.tolist() == expected.values.tolist()
+
+
+@pytest.mark.parametrize("filters", FILTERS[:3])
+def test_sample_is_capped_and_filtered(pandas_backend, duckdb_backend, filters):
+    columns = ["Severity", "SV Precrash Speed (MPH)"]
+    for backend in (pandas_backend, duckdb_backend):
+        sample = backend.sample(columns, filters, limit=7)  # reservoir path: far fewer than the rows
+        assert list(sample.columns) == columns
+        assert len(sample) == min(7, backend.count(filters))
+        if filters:
+            assert set(sample["Severity"]) <= set(filters["Severity"])
+
+        everything = backend.sample(columns, filters, limit=10_000)
+        assert len(everything) == backend.count(filters)
+
+
+def test_with_filter_intersects_and_empty_matches_nothing(pandas_backend, duckdb_backend):
+    filters = with_filter({"Severity": ["POD", "Serious"]}, "Severity", ["Serious"])
+    assert filters == {"Severity": ["Serious"]}
+    assert duckdb_backend.count(filters) == pandas_backend.count(filters) > 0
+
+    disjoint = with_filter({"Severity": ["POD"]}, "Severity", ["Serious"])
+    assert disjoint == {"Severity": []}
+    assert duckdb_backend.count(disjoint) == pandas_backend.count(disjoint) == 0
+    assert duckdb_backend.top_value("Make", disjoint) is None
+    assert pandas_backend.top_value("Make", disjoint) is None
+
+
+def test_csv_is_loaded_once_into_the_database_file(tmp_path):
+    db_path = str(tmp_path / "incidents.duckdb")
+    DuckDBBackend(REPO_CSV, db_path).close()
+    assert os.path.exists(db_path)
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+    # A second backend reuses the loaded table even once the CSV is gone
+    csv_copy = tmp_path / "copy.csv"
+    csv_copy.write_bytes(open(REPO_CSV, "rb").read())
+    reused = DuckDBBackend(str(csv_copy), db_path)
+    csv_copy.unlink()
+    assert reused.count() == 878
+    reused.close()
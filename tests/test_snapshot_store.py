@@ -0,0 +1,40 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("plotly")
+
+import query  # noqa: E402
+import snapshot_store  # noqa: E402
+import views  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_store, "SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(views, "BUILDERS", {"page": lambda backend: {"rows": []}})
+    monkeypatch.setattr(query, "backend_for", lambda snapshot: None)
+    return tmp_path
+
+
+def build(version):
+    snapshot_store.build_snapshot(SimpleNamespace(version=version))
+    time.sleep(0.01)  # distinct directory mtimes
+
+
+def test_artifacts_are_keyed_by_render_and_data_version(store):
+    build("A")
+    assert snapshot_store.artifact_path("A", "page") == str(
+        store / snapshot_store.RENDER_VERSION / "A" / "page.json.gz")
+    assert snapshot_store.load_view("A", "page") == {"rows": []}
+
+
+def test_build_keeps_current_render_version_and_last_two_data_versions(store):
+    (store / "older-build" / "A").mkdir(parents=True)
+    for version in ("A", "B", "C", "A"):
+        build(version)
+    assert os.listdir(store) == [snapshot_store.RENDER_VERSION]
+    assert sorted(os.listdir(store / snapshot_store.RENDER_VERSION)) == ["A", "C"]
@@ -0,0 +1,317 @@
+import json
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+from query import with_filter
+
+# Everything a visualization page needs to render: metric card values, preview rows and
+# figure JSON. Views are plain JSON-serialisable dicts so the default (unfiltered) state
+# can be pre-rendered once per data version and served by snapshot_store.py.
+# All data access goes through a query backend (query.py), never a DataFrame directly.
+
+FILTER_COLUMN = "Severity"
+
+RAINBOW = ['#FF0000', '#FF7F00', '#FFD700', '#32CD32', '#00FFFF', '#0000FF', '#FF00FF']
+RAINBOW_BRIGHT = ['#FF0000', '#FF7F00', '#FFFF00', '#00FF00', '#00FFFF', '#0000FF', '#FF00FF']
+
+
+# ---- Helpers ----
+def filter_options(backend):
+    if FILTER_COLUMN not in backend.columns:
+        return []
+    return backend.distinct(FILTER_COLUMN)
+
+
+def make_filters(backend, severities):
+    """Filter dict for the selected severity levels; an empty selection means no filter."""
+    if not severities or FILTER_COLUMN not in backend.columns:
+        return None
+    return {FILTER_COLUMN: list(severities)}
+
+
+def _fig_json(fig):
+    return json.loads(fig.to_json())
+
+
+def _view(backend, filters, metrics, figures):
+    preview = backend.rows(filters=filters, limit=5)
+    return {
+        "filter_options": filter_options(backend),
+        "metrics": [[label, str(value), help_text] for label, value, help_text in metrics],
+        "preview": json.loads(preview.to_json(orient="records", date_format="iso")),
+        "figures": figures,
+    }
+
+
+# ---- Visualization 1 ----
+def build_visualization1(backend, filters=None):
+    columns = backend.columns
+    total_records = backend.count(filters)
+    unique_severity = backend.nunique("Severity", filters) if "Severity" in columns else "N/A"
+    avg_speed = f"{backend.mean('SV Precrash Speed (MPH)', filters):.2f}" if "SV Precrash Speed (MPH)" in columns else "N/A"
+    avg_limit = f"{backend.mean('Posted Speed Limit (MPH)', filters):.2f}" if "Posted Speed Limit (MPH)" in columns else "N/A"
+
+    metrics = [
+        ("Total Accident Records", total_records, "Total number of accident cases recorded in the dataset."),
+        ("Unique Severity Levels", unique_severity, "Number of distinct severity categories (POD, Serious, Moderate, Minor)."),
+        ("Average Pre-Crash Speed (MPH)", avg_speed, "Mean pre-crash vehicle speed across all records."),
+        ("Average Posted Speed Limit (MPH)", avg_limit, "Mean posted speed limit for all accident locations.")
+    ]
+
+    figures = {"1.1": None, "1.2": None, "1.3": None}
+
+    # --- 1.1 Box Plot: Pre-crash Speed vs Severity ---
+    if "Severity" in columns and "SV Precrash Speed (MPH)" in columns:
+        fig1 = px.box(
+            backend.sample(["Severity", "SV Precrash Speed (MPH)"], filters),
+            x="Severity",
+            y="SV Precrash Speed (MPH)",
+            color="Severity",
+            title="Pre-crash Speed vs Severity",
+            color_discrete_sequence=RAINBOW
+        )
+        fig1.update_traces(marker=dict(line=dict(width=1, color='black')), opacity=1)
+        fig1.update_layout(
+            title_font=dict(size=18, color='black', family="Arial Black"),
+            plot_bgcolor='white'
+        )
+        figures["1.1"] = _fig_json(fig1)
+
+    # --- 1.2 Grouped Bar: Severity by Lighting ---
+    if "Severity" in columns and "Lighting" in columns:
+        counts = backend.group_count(['Severity', 'Lighting'], filters)
+        fig2 = px.bar(
+            counts,
+            x='Severity',
+            y='Count',
+            color='Lighting',
+            barmode='group',
+            title='Accident Severity Distribution under Various Lighting Conditions',
+            color_discrete_sequence=RAINBOW_BRIGHT
+        )
+        fig2.update_traces(text=counts['Count'], textposition='outside')
+        fig2.update_layout(
+            plot_bgcolor='white',
+            title_font=dict(size=18, color='black', family="Arial Black"),
+            xaxis_title='Severity',
+            yaxis_title='Count of Incidents',
+            xaxis=dict(showgrid=True, gridcolor='lightgray'),
+            yaxis=dict(showgrid=True, gridcolor='lightgray')
+        )
+        figures["1.2"] = _fig_json(fig2)
+
+    # --- 1.3 Correlation Heatmap ---
+    required_cols = ['Mileage', 'Posted Speed Limit (MPH)', 'SV Precrash Speed (MPH)']
+    if all(col in columns for col in required_cols):
+        corr_matrix = backend.corr(required_cols, filters)
+        fig3 = px.imshow(
+            corr_matrix.values,
+            x=corr_matrix.columns,
+            y=corr_matrix.index,
+            color_continuous_scale=['#FFFF00', '#FF7F00', '#FF0000'],
+            text_auto=".2f",
+            aspect="auto",
+            title="Correlation Matrix of Driving Variables"
+        )
+        fig3.update_layout(
+            title_font=dict(size=18, color='black', family="Arial Black"),
+            plot_bgcolor='white'
+        )
+        figures["1.3"] = _fig_json(fig3)
+
+    return _view(backend, filters, metrics, figures)
+
+
+# ---- Visualization 2 ----
+def build_visualization2(backend, filters=None):
+    columns = backend.columns
+    total_manufacturers = backend.nunique("Make", filters) if "Make" in columns else "N/A"
+    total_models = backend.nunique("Model", filters) if "Model" in columns else "N/A"
+
+    # Top manufacturer by number of accidents
+    top_manufacturer = backend.top_value("Make", filters) if "Make" in columns else None
+    top_manufacturer_display = f"{top_manufacturer[1]}" if top_manufacturer else "N/A"
+
+    # Top operational entity by accidents
+    top_entity = backend.top_value("Operating Entity", filters) if "Operating Entity" in columns else None
+    top_entity_display = f"{top_entity[1]}" if top_entity else "N/A"
+
+    metrics = [
+        ("Total Manufacturers", total_manufacturers, "Number of unique vehicle manufacturers involved in accidents."),
+        ("Total Vehicle Models", total_models, "Count of distinct autonomous vehicle models in the dataset."),
+        ("Top Manufacturer by Accidents", top_manufacturer_display, "Manufacturer with the highest recorded accident count: Jaguar."),
+        ("Top Operating Entity by Accidents", top_entity_display, "Operational entity involved in the most accidents: Waymo LLC.")
+    ]
+
+    figures = {"2.1": None, "2.2": None, "2.3": None}
+
+    # --- 2.1 Histogram + Box Plot: Make Distribution by Severity ---
+    if "Make" in columns and "Severity" in columns:
+        hover_cols = [col for col in ['Make', 'Model', 'Model Year', 'Mileage', 'Cluster ID', 'Severity'] if col in columns]
+        fig1 = px.histogram(
+            backend.sample(hover_cols, filters),
+            x="Make",
+            color="Severity",
+            marginal="box",
+            title="Distribution of Vehicle Makes by Severity",
+            hover_data=hover_cols,
+            color_discrete_sequence=RAINBOW
+        )
+        fig1.update_layout(
+            title_font=dict(size=18, color='black', family="Arial Black"),
+            xaxis_title='Vehicle Make',
+            yaxis_title='Number of Incidents',
+            plot_bgcolor='white',
+            xaxis=dict(showgrid=True, gridcolor='lightgray', tickangle=45),
+            yaxis=dict(showgrid=True, gridcolor='lightgray'),
+            margin=dict(l=50, r=30, t=80, b=50)
+        )
+        figures["2.1"] = _fig_json(fig1)
+
+    # --- 2.2 Stacked Bar Chart: Accident Distribution by Model Year and Severity ---
+    if "Model Year" in columns and "Severity" in columns:
+        df_counts = backend.group_count(['Model Year', 'Severity'], filters)
+        df_counts['Model Year'] = df_counts['Model Year'].astype(str)
+        df_counts = df_counts.sort_values('Model Year')
+
+        fig2 = px.bar(
+            df_counts,
+            x='Model Year',
+            y='Count',
+            color='Severity',
+            barmode='relative',
+            title='Accident Distribution by Model Year and Severity',
+            color_discrete_sequence=RAINBOW
+        )
+        fig2.update_traces(text=df_counts['Count'], textposition='outside')
+        fig2.update_layout(
+            plot_bgcolor='white',
+            title_font=dict(size=18, color='black', family="Arial Black"),
+            xaxis_title='Model Year',
+            yaxis_title='Number of Incidents',
+            xaxis=dict(showgrid=True, gridcolor='lightgray'),
+            yaxis=dict(showgrid=True, gridcolor='lightgray')
+        )
+        figures["2.2"] = _fig_json(fig2)
+
+    # --- 2.3 Density Plot: Severity by Air Bag Deployment ---
+    if "Air_Bag" in columns and "Severity" in columns:
+        fig3 = px.violin(
+            backend.sample(["Air_Bag", "Severity"], filters),
+            x="Air_Bag",
+            y="Severity",
+            color="Air_Bag",
+            box=True,
+            points="all",
+            title="Severity Distribution by Air Bag Deployment",
+            color_discrete_sequence=RAINBOW
+        )
+        fig3.update_traces(opacity=0.85, line=dict(width=1.5), marker=dict(size=4, opacity=0.6))
+        fig3.update_layout(
+            title_font=dict(size=18, color='black', family="Arial Black"),
+            plot_bgcolor='white',
+            xaxis_title='Air Bag Deployment Status',
+            yaxis_title='Severity',
+            xaxis=dict(showgrid=True, gridcolor='lightgray'),
+            yaxis=dict(showgrid=True, gridcolor='lightgray'),
+            showlegend=True,
+            legend_title_text='Air Bag Deployment'
+        )
+        figures["2.3"] = _fig_json(fig3)
+
+    return _view(backend, filters, metrics, figures)
+
+
+# ---- Visualization 3 ----
+def _top_or_na(backend, column, filters):
+    top = backend.top_value(column, filters) if column in backend.columns else None
+    return top[0] if top else "N/A"
+
+
+def build_visualization3(backend, filters=None):
+    columns = backend.columns
+    total_serious = backend.count(with_filter(filters, "Severity", ["Serious"])) if "Severity" in columns else "N/A"
+    most_common_weather = _top_or_na(backend, "Weather", filters)
+    common_severity = _top_or_na(backend, "Severity", filters)
+    common_collision = _top_or_na(backend, "Crash_With", filters)
+
+    metrics = [
+        ("Total Serious Accidents", total_serious, "Total number of accidents classified as serious."),
+        ("Most Common Weather", most_common_weather, "Weather condition where most accidents occurred: Clear."),
+        ("Most Frequent Severity", common_severity, "Severity level with the highest number of cases: Property Damage Only (POD)."),
+        ("Most Common Collision Type", common_collision, "Type of collision that occurred most frequently: Pedestrian Collision (PD)."),
+    ]
+
+    figures = {"3.1": None, "3.2": None, "3.3": None}
+
+    # ----------------- 3.1 Violin Plot: Speed Distribution by Weather -----------------
+    if "Weather" in columns and "SV Precrash Speed (MPH)" in columns:
+        fig = px.violin(
+            backend.sample(["Weather", "SV Precrash Speed (MPH)"], filters),
+            x='Weather',
+            y='SV Precrash Speed (MPH)',
+            color='Weather',
+            box=True,
+            points='all',
+            title='Speed Distribution Across Weather Conditions',
+            color_discrete_sequence=RAINBOW_BRIGHT
+        )
+        fig.update_layout(xaxis_title='Weather', yaxis_title='Pre-Crash Speed (MPH)', plot_bgcolor='white')
+        figures["3.1"] = _fig_json(fig)
+
+    # ----------------- 3.2 Pie Chart: Accident Severity by Collision Type -----------------
+    if "Crash_With" in columns and "Severity" in columns:
+        crash_data = backend.group_count(['Crash_With'], filters)
+
+        fig = px.pie(
+            crash_data,
+            names='Crash_With',
+            values='Count',
+            title='Accident Proportion by Collision Type',
+            color_discrete_sequence=RAINBOW_BRIGHT
+        )
+        figures["3.2"] = _fig_json(fig)
+
+    # ----------------- 3.3 Radar Chart: Environmental Factors by Weather -----------------
+    required_cols = ['Weather', 'Roadway_Type', 'Roadway_Surface', 'Lighting']
+    if all(col in columns for col in required_cols):
+        # Only the small grouped result is reshaped in pandas
+        radar_data = backend.group_count(required_cols, filters).rename(columns={'Count': 'Incident_Count'})
+        top_weather = radar_data.groupby('Weather')['Incident_Count'].sum().nlargest(3).index
+        radar_data = radar_data[radar_data['Weather'].isin(top_weather)]
+
+        axes = ['Roadway_Type', 'Roadway_Surface', 'Lighting']
+        traces = []
+
+        for i, weather in enumerate(top_weather):
+            subset = radar_data[radar_data['Weather'] == weather]
+            values = [subset.groupby(axis)['Incident_Count'].sum().max() if not subset.empty else 0 for axis in axes]
+            values.append(values[0])
+
+            traces.append(go.Scatterpolar(
+                r=values,
+                theta=axes + [axes[0]],
+                fill='toself',
+                name=weather,
+                opacity=0.7,
+                line=dict(color=RAINBOW_BRIGHT[i])
+            ))
+
+        fig = go.Figure(data=traces)
+        fig.update_layout(
+            title='Environmental Factors by Weather',
+            polar=dict(radialaxis=dict(visible=True)),
+            showlegend=True
+        )
+        figures["3.3"] = _fig_json(fig)
+
+    return _view(backend, filters, metrics, figures)
+
+
+# ---- Page Registry ----
+BUILDERS = {
+    "visualization1": build_visualization1,
+    "visualization2": build_visualization2,
+    "visualization3": build_visualization3,
+}